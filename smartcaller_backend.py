@@ -1,13 +1,25 @@
 # smartcaller_backend.py
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional
+from functools import lru_cache
 from datetime import datetime, timezone
+from collections import OrderedDict
+import asyncio
+import hashlib
+import threading
+import time
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 import random
+import httpx
 import re
 import os
 import tldextract
+import ahocorasick
+from joblib import Parallel, delayed, cpu_count
 
 # ========= FastAPI app =========
 app = FastAPI(title="Smart Caller Backend", version="1.0.0")
@@ -28,29 +40,33 @@ def root():
 # ========= Config & Constants =========
 TARGET_PERSONAS = set([p.strip() for p in os.getenv("TARGET_PERSONAS", "CEO,CFO,COO,Marketing,Sales").split(",") if p.strip()])
 PRIORITY_COUNTRIES = set([c.strip().upper() for c in os.getenv("PRIORITY_COUNTRIES", "FR,BE,CH").split(",") if c.strip()])
+# Imports at least this big are classified in chunks across worker processes
+PARALLEL_MIN_ROWS = int(os.getenv("PARALLEL_MIN_ROWS", "20000"))
+PARALLEL_JOBS = int(os.getenv("PARALLEL_JOBS", "0")) or cpu_count()
 FREE_EMAIL_DOMAINS = {"gmail.com","yahoo.com","hotmail.com","outlook.com","live.com","icloud.com","proton.me","protonmail.com"}
 
+# Title keywords match as whole words (lowercased title), first entry in map order wins
 SENIORITY_MAP = {
-    r"\b(owner|founder|co-?founder|partner|principal)\b": ("exec", 3),
-    r"\b(ceo|cto|cfo|coo|cmo|vp|vice president|head of)\b": ("exec", 3),
-    r"\b(director|director of|directeur|directrice)\b": ("director", 2),
-    r"\b(manager|lead|responsable|chef de)\b": ("manager", 1),
-    r"\b(intern|stagiaire|assistant|junior)\b": ("junior", 0),
+    ("owner","founder","cofounder","co-founder","partner","principal"): ("exec", 3),
+    ("ceo","cto","cfo","coo","cmo","vp","vice president","head of"): ("exec", 3),
+    ("director","director of","directeur","directrice"): ("director", 2),
+    ("manager","lead","responsable","chef de"): ("manager", 1),
+    ("intern","stagiaire","assistant","junior"): ("junior", 0),
 }
 PERSONA_MAP = {
-    r"\b(cfo|finance|accounting|comptable|daf)\b": "CFO",
-    r"\b(coo|ops|operation|logistics|logistique|supply)\b": "COO",
-    r"\b(cmo|marketing|growth|demand gen|acquisition)\b": "Marketing",
-    r"\b(cto|tech|developer|engineer|it|devops|sre)\b": "Tech",
-    r"\b(ceo|founder|owner|pdg|gérant)\b": "CEO",
-    r"\b(sales|commercial|account executive|ae|business developer|bdm)\b": "Sales",
-    r"\b(customer success|cs|support client|success manager)\b": "Customer Success",
-    r"\b(product|pm|product manager)\b": "Product",
-    r"\b(data|analytics|bi|data scientist|data engineer)\b": "Data",
-    r"\b(security|secops|ciso|iso 27001)\b": "Security",
-    r"\b(legal|juridique|avocat|counsel)\b": "Legal",
-    r"\b(hr|talent|recruit|rh|recruteur|recrutement)\b": "HR",
-    r"\b(purchasing|achat|procurement|acheteur)\b": "Procurement",
+    ("cfo","finance","accounting","comptable","daf"): "CFO",
+    ("coo","ops","operation","logistics","logistique","supply"): "COO",
+    ("cmo","marketing","growth","demand gen","acquisition"): "Marketing",
+    ("cto","tech","developer","engineer","it","devops","sre"): "Tech",
+    ("ceo","founder","owner","pdg","gérant"): "CEO",
+    ("sales","commercial","account executive","ae","business developer","bdm"): "Sales",
+    ("customer success","cs","support client","success manager"): "Customer Success",
+    ("product","pm","product manager"): "Product",
+    ("data","analytics","bi","data scientist","data engineer"): "Data",
+    ("security","secops","ciso","iso 27001"): "Security",
+    ("legal","juridique","avocat","counsel"): "Legal",
+    ("hr","talent","recruit","rh","recruteur","recrutement"): "HR",
+    ("purchasing","achat","procurement","acheteur"): "Procurement",
 }
 INTENT_KEYWORDS = {
     "demo": [
@@ -67,161 +83,257 @@ SOURCE_WEIGHTS = {
 }
 COUNTRY_PREFIX = { "FR":"+33","BE":"+32","CH":"+41","ES":"+34","IT":"+39","DE":"+49","UK":"+44","US":"+1"}
 
+_PREFIX_TO_COUNTRY = {v:k for k,v in COUNTRY_PREFIX.items()}
+# Longest prefix first so a longer code is never shadowed by a shorter one
+_PHONE_PREFIX_RE = re.compile("^(" + "|".join(map(re.escape, sorted(_PREFIX_TO_COUNTRY, key=len, reverse=True))) + ")")
+
+_SENIORITY = list(SENIORITY_MAP.values())
+_PERSONAS = list(PERSONA_MAP.values())
+
+INTENT_BASE = {"demo": 65, "resource": 50, "other": 42}
+INTENTS = list(INTENT_BASE)
+
+# Fixed category sets for the low-cardinality lead columns (int8 codes instead of repeated strings)
+INTENT_DTYPE = pd.CategoricalDtype(INTENTS)
+SENIORITY_DTYPE = pd.CategoricalDtype(list(dict.fromkeys(lab for lab, _ in _SENIORITY)) + ["other"])
+PERSONA_DTYPE = pd.CategoricalDtype(list(dict.fromkeys(_PERSONAS)) + ["Other"])
+COUNTRY_DTYPE = pd.CategoricalDtype(list(COUNTRY_PREFIX))
+
+# Title families (seniority / persona) in one automaton: a single linear pass per title.
+# payload = ((family, map index), ...) + keyword length, so a hit's start offset can be recovered
+def _build_title_automaton() -> ahocorasick.Automaton:
+    hits_by_kw: Dict[str, Set[Tuple[str,int]]] = {}
+    for family, groups in (("seniority", SENIORITY_MAP), ("persona", PERSONA_MAP)):
+        for i, kws in enumerate(groups):
+            for kw in kws:
+                hits_by_kw.setdefault(kw, set()).add((family, i))
+    A = ahocorasick.Automaton()
+    for kw, hits in hits_by_kw.items():
+        A.add_word(kw, (tuple(sorted(hits)), len(kw)))
+    A.make_automaton()
+    return A
+
+TITLE_AUTOMATON = _build_title_automaton()
+
+# Keyword alternations for the column-level checks (plain substrings, like the old `kw in s`)
+def _keywords_pattern(kws: List[str]) -> str:
+    return "|".join(map(re.escape, kws))
+
+DEMO_PATTERN = _keywords_pattern(INTENT_KEYWORDS["demo"])
+RESOURCE_PATTERN = _keywords_pattern(INTENT_KEYWORDS["resource"])
+URGENCY_PATTERN = _keywords_pattern(URGENCY_KW)
+
 # ========= Helpers =========
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
 def parse_title(title: str) -> Tuple[str,int,str]:
+    # Keywords only count as whole words (same rule as re's \b); lowest map index wins per family
     t = (title or "").lower()
-    seniority, sscore = "other", 0
-    for pat,(lab,sc) in SENIORITY_MAP.items():
-        if re.search(pat,t):
-            seniority, sscore = lab, sc
-            break
-    persona = "Other"
-    for pat,p in PERSONA_MAP.items():
-        if re.search(p,t):
-            persona = p
-            break
+    sen_i, per_i = len(_SENIORITY), len(_PERSONAS)  # lowest map index hit so far (past the end = none)
+    for end, (hits, n) in TITLE_AUTOMATON.iter(t):
+        start = end - n + 1
+        if (start > 0 and _is_word_char(t[start-1])) or (end + 1 < len(t) and _is_word_char(t[end+1])):
+            continue
+        for family, i in hits:
+            if family == "seniority": sen_i = min(sen_i, i)
+            else: per_i = min(per_i, i)
+    seniority, sscore = _SENIORITY[sen_i] if sen_i < len(_SENIORITY) else ("other", 0)
+    persona = _PERSONAS[per_i] if per_i < len(_PERSONAS) else "Other"
     return seniority, sscore, persona
 
-def detect_intent(source: str, form_name: str, message: str) -> str:
-    s = " ".join([(source or ""), (form_name or ""), (message or "")]).lower()
-    for kw in INTENT_KEYWORDS["demo"]:
-        if kw in s: return "demo"
-    for kw in INTENT_KEYWORDS["resource"]:
-        if kw in s: return "resource"
-    return "other"
-
-def email_domain(email:str) -> str:
-    try: return email.split("@",1)[1].lower().strip()
-    except: return ""
-
-def is_business_email(email:str) -> bool:
-    d = email_domain(email)
-    return bool(d) and d not in FREE_EMAIL_DOMAINS
-
-def domain_to_company(email:str, fallback_company:str) -> str:
-    d = email_domain(email)
-    if not d: return fallback_company
-    ex = tldextract.extract(d)
-    brand = ex.domain.capitalize()
-    return fallback_company or brand
-
-def country_from_phone(phone:str) -> Optional[str]:
-    p = (phone or "").replace(" ","")
-    for code in COUNTRY_PREFIX.values():
-        if p.startswith(code):
-            for k,v in COUNTRY_PREFIX.items():
-                if v==code: return k
-    return None
-
-def days_since(dt_str:str) -> Optional[int]:
-    if not dt_str: return None
-    # Try a few common formats
-    for fmt in ("%Y-%m-%d","%Y-%m-%d %H:%M:%S","%d/%m/%Y","%d/%m/%Y %H:%M"):
-        try:
-            dt = datetime.strptime(dt_str, fmt).replace(tzinfo=timezone.utc)
-            return max(0, (datetime.now(timezone.utc) - dt).days)
-        except:
-            pass
-    return None
-
-def score_fit(
-    intent:str, seniority_score:int, persona:str, email:str, phone:str, company_name:str,
-    message:str, source:str, utm_source:str=None, created_at:str=None
-) -> int:
-    base = {"demo": 65, "resource": 50, "other": 42}.get(intent, 42)
-    base += 8 * seniority_score
-    if persona in TARGET_PERSONAS: base += 6
-    base += 5 if is_business_email(email) else -4
-    co = domain_to_company(email, company_name or "")
-    if co and len(co) >= 2: base += 3
-    s = (source or "").lower()
-    base += SOURCE_WEIGHTS.get(s, 0)
-    if utm_source: base += SOURCE_WEIGHTS.get(utm_source.lower(), 0)
-    m = (message or "").lower()
-    if any(kw in m for kw in URGENCY_KW): base += 6
-    ctry = country_from_phone(phone or "")
-    if ctry and ctry.upper() in PRIORITY_COUNTRIES: base += 3
-    d = days_since(created_at or "")
-    if d is not None:
-        if d <= 1: base += 6
-        elif d <= 7: base += 2
-        elif d > 30: base -= 4
-    return max(0, min(95, base))
-
-def suggest_workflow(intent:str, score:int) -> str:
-    if intent == "demo" and score >= 68: return "Réponse rapide"
-    if intent == "resource" and score >= 58: return "Nurturing doux"
-    return "Safe hours"
+def _contains(col: pd.Series, pattern: str) -> np.ndarray:
+    # One regex scan over the whole column (pyarrow kernel on arrow-backed strings)
+    return col.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)
+
+def detect_intent(source: pd.Series, form_name: pd.Series, message: pd.Series) -> pd.Categorical:
+    # Demo keywords win over resource ones, matched anywhere in source+form+message
+    text = (source + " " + form_name + " " + message).str.lower()
+    intent = np.select([_contains(text, DEMO_PATTERN), _contains(text, RESOURCE_PATTERN)], ["demo", "resource"], "other")
+    return pd.Categorical(intent, dtype=INTENT_DTYPE)
+
+def is_urgent(message: pd.Series) -> np.ndarray:
+    return _contains(message.str.lower(), URGENCY_PATTERN)
+
+def email_domains(emails: pd.Series) -> pd.Series:
+    # Lowercased part after the first "@" ("" when there is none)
+    return emails.str.split("@", n=1).str[1].fillna("").str.lower().str.strip()
+
+@lru_cache(maxsize=8192)
+def domain_brand(domain:str) -> str:
+    # tldextract parsing is costly and leads often share a domain
+    return tldextract.extract(domain).domain.capitalize()
+
+def domain_brands(domains: pd.Series) -> pd.Series:
+    # tldextract only runs once per distinct domain
+    brands = {d: domain_brand(d) for d in domains.unique() if d}
+    return domains.map(brands).fillna("")
+
+def country_from_phones(phones: pd.Series) -> pd.Series:
+    # Country code per phone, NaN when no known prefix matches
+    prefix = phones.str.replace(" ", "", regex=False).str.extract(_PHONE_PREFIX_RE.pattern, expand=False)
+    return prefix.map(_PREFIX_TO_COUNTRY).astype(COUNTRY_DTYPE)
+
+DATE_FORMATS = ("%Y-%m-%d","%Y-%m-%d %H:%M:%S","%d/%m/%Y","%d/%m/%Y %H:%M")
+
+def days_since(created_at: pd.Series) -> pd.Series:
+    # One vectorised parse per accepted format (timestamps taken as UTC), NaN when none matches
+    parsed = pd.to_datetime(created_at, format=DATE_FORMATS[0], errors="coerce")
+    for fmt in DATE_FORMATS[1:]:
+        parsed = parsed.fillna(pd.to_datetime(created_at, format=fmt, errors="coerce"))
+    return (pd.Timestamp.now(tz="UTC").tz_localize(None) - parsed).dt.days.clip(lower=0)
+
+# Lookup tables indexed by category code; code -1 (value not in the categories) reads the trailing default
+_INTENT_BASE_TABLE = np.array([INTENT_BASE[i] for i in INTENTS] + [42], dtype=np.int32)
+_SOURCES = list(SOURCE_WEIGHTS)
+_SOURCE_WEIGHT_TABLE = np.array([SOURCE_WEIGHTS[s] for s in _SOURCES] + [0], dtype=np.int32)
+
+def _codes(values: pd.Series, categories: List[str]) -> np.ndarray:
+    return pd.Categorical(values, categories=categories).codes
+
+def _score_kernel(
+    intent:np.ndarray, seniority:np.ndarray, persona_flag:np.ndarray, business:np.ndarray, company_flag:np.ndarray,
+    source:np.ndarray, utm:np.ndarray, urgent:np.ndarray, country_flag:np.ndarray, age:np.ndarray
+) -> np.ndarray:
+    # Numbers only: category codes, 0/1 flags and ages (float, NaN = unknown) in, int32 scores out
+    base = _INTENT_BASE_TABLE[intent] + 8 * seniority
+    base += 6 * persona_flag + np.where(business, 5, -4) + 3 * company_flag
+    base += _SOURCE_WEIGHT_TABLE[source] + _SOURCE_WEIGHT_TABLE[utm]
+    base += 6 * urgent + 3 * country_flag
+    base += np.select([age <= 1, age <= 7, age > 30], [6, 2, -4], 0).astype(np.int32)  # NaN fails every test
+    return np.clip(base, 0, 95)
+
+def score_fit(features: pd.DataFrame) -> np.ndarray:
+    # One row per lead: intent (INTENT_DTYPE), seniority_score, persona, business_email, country,
+    # company (sheet value or email brand), urgent, source, utm_source, age_days
+    f = features
+    return _score_kernel(
+        f["intent"].cat.codes.to_numpy(),
+        f["seniority_score"].to_numpy(dtype=np.int32),
+        f["persona"].isin(TARGET_PERSONAS).to_numpy(dtype=np.int32),
+        f["business_email"].to_numpy(dtype=bool),
+        (f["company"].str.len() >= 2).to_numpy(dtype=np.int32),
+        _codes(f["source"].str.lower(), _SOURCES),
+        _codes(f["utm_source"].str.lower(), _SOURCES),
+        f["urgent"].to_numpy(dtype=np.int32),
+        f["country"].isin(PRIORITY_COUNTRIES).to_numpy(dtype=np.int32),
+        f["age_days"].to_numpy(dtype=float),
+    )
+
+def suggest_workflow(intent: np.ndarray, score: np.ndarray) -> np.ndarray:
+    return np.select(
+        [(intent == "demo") & (score >= 68), (intent == "resource") & (score >= 58)],
+        ["Réponse rapide", "Nurturing doux"],
+        "Safe hours",
+    )
 
 # ========= Core classification & summary =========
-def classify_leads(df: pd.DataFrame) -> List[Dict]:
-    results: List[Dict] = []
-    for _, row in df.iterrows():
-        title   = str(row.get("job_title", "") or "")
-        msg     = str(row.get("message", "") or "")
-        source  = str(row.get("source", "") or "")
-        utm_s   = str(row.get("utm_source", "") or "")
-        company = str(row.get("company_name", "") or "")
-        phone   = str(row.get("phone", "") or "")
-        email   = str(row.get("email", "") or "")
-        created = str(row.get("created_at", "") or "")
-        first   = str(row.get("first_name", "") or "")
-        last    = str(row.get("last_name", "") or "")
-
-        seniority_label, seniority_score, persona = parse_title(title)
-        intent = detect_intent(source, str(row.get("form_name","") or ""), msg)
-        score = score_fit(intent, seniority_score, persona, email, phone, company, msg, source, utm_s, created)
-        workflow = suggest_workflow(intent, score)
-
-        results.append({
-            "name": f"{first} {last}".strip(),
-            "email": email,
-            "company": company or domain_to_company(email, ""),
-            "job_title": title,
-            "persona": persona,
-            "seniority": seniority_label,
-            "intent": intent,
-            "score": score,
-            "workflow_suggested": workflow,
-            "country": country_from_phone(phone) or None,
-            "business_email": is_business_email(email),
-        })
-    return results
-
-def summarize(leads: List[Dict]) -> Dict:
-    total = len(leads)
-    hot = sum(1 for l in leads if l.get("score",0) >= 70)
+LEAD_COLUMNS = [
+    "first_name", "last_name", "email", "phone", "job_title", "company_name",
+    "message", "source", "form_name", "utm_source", "created_at",
+]
+# Arrow-backed strings: .str operations below run as pyarrow compute kernels
+LEAD_DTYPE = "string[pyarrow]"
+
+def classify_leads(df: pd.DataFrame) -> pd.DataFrame:
+    # One row per lead (see lead_records for the JSON form), columns kept typed for summarize
+    # Below the threshold process spawn + pickling costs more than it saves
+    if len(df) < PARALLEL_MIN_ROWS or PARALLEL_JOBS < 2:
+        return _classify_chunk(df)
+    size = -(-len(df) // PARALLEL_JOBS)
+    chunks = [df.iloc[i:i+size] for i in range(0, len(df), size)]
+    results = Parallel(n_jobs=PARALLEL_JOBS, backend="loky")(delayed(_classify_chunk)(c) for c in chunks)
+    return pd.concat(results)
+
+def _classify_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    # Missing columns / NaN cells normalised once, then every feature is built column-wise
+    df = df.reindex(columns=LEAD_COLUMNS).astype(LEAD_DTYPE).fillna("")
+    titles = df["job_title"].unique().tolist()
+    parsed = (pd.DataFrame([parse_title(t) for t in titles], index=titles, columns=["seniority", "seniority_score", "persona"])
+              .reindex(df["job_title"].tolist()).set_axis(df.index))
+    domains = email_domains(df["email"])
+
+    features = pd.DataFrame({
+        "intent": detect_intent(df["source"], df["form_name"], df["message"]),
+        "seniority_score": parsed["seniority_score"],
+        "persona": parsed["persona"].astype(PERSONA_DTYPE),
+        "business_email": domains.ne("") & ~domains.isin(FREE_EMAIL_DOMAINS),
+        "country": country_from_phones(df["phone"]),
+        "company": df["company_name"].where(df["company_name"].ne(""), domain_brands(domains)),
+        "urgent": is_urgent(df["message"]),
+        "source": df["source"],
+        "utm_source": df["utm_source"],
+        "age_days": days_since(df["created_at"]),
+    }, index=df.index)
+    score = score_fit(features)
+
+    out = pd.DataFrame({
+        "name": (df["first_name"] + " " + df["last_name"]).str.strip(),
+        "email": df["email"],
+        "company": features["company"],
+        "job_title": df["job_title"],
+        "persona": features["persona"],
+        "seniority": parsed["seniority"].astype(SENIORITY_DTYPE),
+        "intent": features["intent"],
+        "score": score,
+        "workflow_suggested": suggest_workflow(features["intent"].to_numpy(), score),
+        "country": features["country"],
+        "business_email": features["business_email"],
+        "age_days": features["age_days"].astype("Int64"),
+    }, index=df.index)
+    return out
+
+def lead_records(leads: pd.DataFrame) -> List[Dict]:
+    # API form of classify_leads output: one dict per lead, missing values (NaN / NA) as None
+    return leads.astype(object).where(leads.notna(), None).to_dict(orient="records")
+
+def filter_leads(
+    leads: pd.DataFrame, persona: Optional[str]=None, intent: Optional[str]=None, seniority: Optional[str]=None,
+    country: Optional[str]=None, workflow: Optional[str]=None, min_score: Optional[int]=None,
+) -> pd.DataFrame:
+    # Vectorised mask over the classified frame; unset filters are ignored
+    mask = np.ones(len(leads), dtype=bool)
+    for col, value in (("persona", persona), ("intent", intent), ("seniority", seniority),
+                       ("country", country), ("workflow_suggested", workflow)):
+        if value: mask &= (leads[col] == value).to_numpy(dtype=bool)
+    if min_score is not None: mask &= leads["score"].to_numpy() >= min_score
+    return leads.loc[mask]
+
+SUMMARY_COLUMNS = ["intent", "persona", "seniority", "country", "workflow_suggested", "business_email", "score", "age_days"]
+# Same cut-offs as the freshness adjustment in score_fit
+FRESHNESS_BINS = [-1, 1, 7, 30, np.inf]
+FRESHNESS_LABELS = ["last_24h", "last_7d", "last_30d", "older"]
+
+def _distribution(col: pd.Series) -> Dict[str,int]:
+    # Counts in order of first appearance, missing / empty values skipped
+    # (value_counts on a categorical lists every category, in category order)
+    col = col[col.notna() & col.ne("")]
+    counts = col.value_counts(sort=False)
+    return {k: int(counts[k]) for k in col.unique()}
+
+def summarize(leads: pd.DataFrame) -> Dict:
+    ldf = leads.reindex(columns=SUMMARY_COLUMNS)
+    total = len(ldf)
+    scores = pd.to_numeric(ldf["score"], errors="coerce")
+    hot = int((scores >= 70).sum())
     resp_rate = round(random.uniform(0.22, 0.35), 2)  # placeholder until you track real sends
 
     # Distributions
-    intent_dist: Dict[str,int] = {}
-    persona_dist: Dict[str,int] = {}
-    seniority_dist: Dict[str,int] = {}
-    country_dist: Dict[str,int] = {}
-    workflow_dist: Dict[str,int] = {}
-
-    scores = []
-    business_emails = 0
-    for l in leads:
-        intent_dist[l["intent"]] = intent_dist.get(l["intent"],0) + 1
-        persona_dist[l["persona"]] = persona_dist.get(l["persona"],0) + 1
-        seniority_dist[l["seniority"]] = seniority_dist.get(l["seniority"],0) + 1
-        if l.get("country"):
-            country_dist[l["country"]] = country_dist.get(l["country"],0) + 1
-        wf = l.get("workflow_suggested","")
-        if wf: workflow_dist[wf] = workflow_dist.get(wf,0) + 1
-        if l.get("business_email"): business_emails += 1
-        if isinstance(l.get("score"), (int,float)): scores.append(l["score"])
-
-    avg_score = round(sum(scores)/len(scores), 1) if scores else 0.0
+    intent_dist = _distribution(ldf["intent"])
+    persona_dist = _distribution(ldf["persona"])
+    seniority_dist = _distribution(ldf["seniority"])
+    country_dist = _distribution(ldf["country"])
+    workflow_dist = _distribution(ldf["workflow_suggested"])
+
+    business = ldf["business_email"]
+    business_emails = int((business.notna() & business.astype(bool)).sum())
+
+    avg_score = round(float(scores.mean()), 1) if scores.notna().any() else 0.0
     business_ratio = round((business_emails/total)*100, 1) if total > 0 else 0.0
 
-    freshness = {
-        "last_24h": None,
-        "last_7d": None,
-        "last_30d": None,
-        "older": None
-    }
+    ages = pd.to_numeric(ldf["age_days"], errors="coerce")
+    buckets = pd.cut(ages, bins=FRESHNESS_BINS, labels=FRESHNESS_LABELS).value_counts(sort=False)
+    freshness = {k: int(v) for k, v in buckets.items()}
 
     insights = []
     if avg_score >= 65: insights.append("Qualité moyenne élevée des leads (score moyen ≥ 65).")
@@ -256,38 +368,95 @@ def summarize(leads: List[Dict]) -> Dict:
     }
 
 # ========= CSV import =========
-def get_csv_from_gsheet(url: str) -> pd.DataFrame:
+async def get_csv_from_gsheet(url: str) -> Tuple[bytes, str]:
+    # Raw CSV bytes + content hash, so identical sheets can be served from the import cache.
+    # Async so the download doesn't hold a worker thread for the whole round-trip
     try:
         if "spreadsheets" in url:
             csv_url = url.replace("/edit#gid=", "/export?format=csv&gid=")
-            df = pd.read_csv(csv_url)
-            return df
+        elif "export?format=csv" in url:
+            csv_url = url
         else:
-            if "export?format=csv" in url:
-                return pd.read_csv(url)
             raise Exception("URL Google Sheet invalide (attendu: export CSV).")
+        # Google answers export URLs with a redirect to googleusercontent.com
+        async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
+            resp = await client.get(csv_url)
+        resp.raise_for_status()
+        csv_bytes = resp.content
+        return csv_bytes, hashlib.blake2b(csv_bytes, digest_size=16).hexdigest()
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Erreur lecture Google Sheet : {e}")
 
+def read_leads_csv(csv_bytes: bytes) -> pd.DataFrame:
+    # Parsed by pyarrow with only the columns classify_leads reads, all typed as strings up front:
+    # no inference pass, and phones like +33612345678 never turn into integers.
+    # (pd.read_csv(engine="pyarrow") infers first and casts after, and rejects unknown usecols)
+    try:
+        table = pa_csv.read_csv(
+            pa.py_buffer(csv_bytes),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=LEAD_COLUMNS,
+                include_missing_columns=True,
+                column_types={c: pa.string() for c in LEAD_COLUMNS},
+                strings_can_be_null=True,  # "", "NA", "null"... stay missing, like pd.read_csv
+            ),
+        )
+        return table.to_pandas(types_mapper={pa.string(): pd.api.types.pandas_dtype(LEAD_DTYPE)}.get)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Erreur lecture Google Sheet : {e}")
+
+# ========= Import cache =========
+# (url, content hash) -> (leads DataFrame, {"leads", "summary"}); TTL because lead ages depend on the current date
+IMPORT_CACHE_SIZE = 32
+IMPORT_CACHE_TTL = 300  # seconds
+_IMPORT_CACHE: "OrderedDict[Tuple[str,str], Tuple[float,Tuple[pd.DataFrame,Dict]]]" = OrderedDict()
+_IMPORT_CACHE_LOCK = threading.Lock()
+
+def _cache_get(key: Tuple[str,str]) -> Optional[Tuple[pd.DataFrame,Dict]]:
+    with _IMPORT_CACHE_LOCK:
+        hit = _IMPORT_CACHE.get(key)
+        if hit is None: return None
+        if time.monotonic() - hit[0] > IMPORT_CACHE_TTL:
+            del _IMPORT_CACHE[key]
+            return None
+        _IMPORT_CACHE.move_to_end(key)
+        return hit[1]
+
+def _cache_put(key: Tuple[str,str], result: Tuple[pd.DataFrame,Dict]) -> None:
+    with _IMPORT_CACHE_LOCK:
+        _IMPORT_CACHE[key] = (time.monotonic(), result)
+        _IMPORT_CACHE.move_to_end(key)
+        while len(_IMPORT_CACHE) > IMPORT_CACHE_SIZE:
+            _IMPORT_CACHE.popitem(last=False)
+
 # ========= API endpoints =========
-_LAST_SUMMARY: Optional[Dict] = None
+# Last import, kept as the typed leads DataFrame too so follow-up queries don't re-classify
+_LAST_STATE: Dict = {"leads_df": None, "summary": None, "ts": 0.0}
+
+def _analyze_csv(csv_bytes: bytes) -> Tuple[pd.DataFrame, Dict]:
+    leads = classify_leads(read_leads_csv(csv_bytes))
+    return leads, {"leads": lead_records(leads), "summary": summarize(leads)}
 
 @app.post("/api/leads/import")
-def import_leads(payload: dict):
+async def import_leads(payload: dict):
     url = payload.get("url")
     if not url:
         raise HTTPException(status_code=400, detail="Champ 'url' requis.")
-    df = get_csv_from_gsheet(url)
-    leads = classify_leads(df)
-    summary = summarize(leads)
-    global _LAST_SUMMARY
-    _LAST_SUMMARY = summary
-    return {"leads": leads, "summary": summary}
+    csv_bytes, digest = await get_csv_from_gsheet(url)
+    key = (url, digest)
+    hit = _cache_get(key)
+    if hit is None:
+        # CPU-bound: keep it off the event loop
+        hit = await asyncio.get_running_loop().run_in_executor(None, _analyze_csv, csv_bytes)
+        _cache_put(key, hit)
+    leads_df, result = hit
+    _LAST_STATE.update(leads_df=leads_df, summary=result["summary"], ts=time.time())
+    return result
 
 @app.get("/api/dashboard/summary")
 def dashboard_summary():
-    if _LAST_SUMMARY:
-        return _LAST_SUMMARY
+    if _LAST_STATE["summary"]:
+        return _LAST_STATE["summary"]
     return {
         "leads_total": 0,
         "leads_hot": 0,
@@ -306,3 +475,20 @@ def dashboard_summary():
         ],
         "insights": ["Aucune analyse disponible. Importez d’abord des leads."],
     }
+
+@app.get("/api/leads")
+def list_leads(
+    persona: Optional[str] = None, intent: Optional[str] = None, seniority: Optional[str] = None,
+    country: Optional[str] = None, workflow: Optional[str] = None, min_score: Optional[int] = None,
+    limit: Optional[int] = None,
+):
+    leads_df = _LAST_STATE["leads_df"]
+    if leads_df is None:
+        return {"total": 0, "imported_at": None, "leads": []}
+    matched = filter_leads(leads_df, persona=persona, intent=intent, seniority=seniority,
+                           country=country, workflow=workflow, min_score=min_score)
+    return {
+        "total": len(matched),
+        "imported_at": datetime.fromtimestamp(_LAST_STATE["ts"], timezone.utc).isoformat(),
+        "leads": lead_records(matched.head(limit) if limit else matched),
+    }